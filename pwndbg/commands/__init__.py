@@ -1,6 +1,5 @@
 import argparse
-import functools
-import io
+import re
 from typing import Dict
 from typing import List
 
@@ -8,49 +7,81 @@ import gdb
 
 import pwndbg.color.message as message
 import pwndbg.exception
+import pwndbg.gdblib.events
 import pwndbg.gdblib.kernel
 import pwndbg.gdblib.regs
 import pwndbg.heap
+import pwndbg.lib.memoize
 from pwndbg.heap.ptmalloc import DebugSymsHeap
 from pwndbg.heap.ptmalloc import HeuristicHeap
 from pwndbg.heap.ptmalloc import SymbolUnresolvableError
 
-commands = []  # type: List[Command]
-command_names = set()
+commands = {}  # type: Dict[str, Command]
+command_names = commands.keys()
+
+# Lines of `help all` that do not describe a command
+_SKIP_PREFIXES = ("Command class:", "Unclassified commands")
 
 
 def list_current_commands():
-    current_pagination = gdb.execute("show pagination", to_string=True)
-    current_pagination = current_pagination.split()[-1].rstrip(
-        "."
-    )  # Take last word and skip period
+    current_pagination = gdb.parameter("pagination")
 
     gdb.execute("set pagination off")
-    command_list = gdb.execute("help all", to_string=True).strip().split("\n")
-    existing_commands = set()
-    for line in command_list:
-        line = line.strip()
-        # Skip non-command entries
-        if (
-            len(line) == 0
-            or line.startswith("Command class:")
-            or line.startswith("Unclassified commands")
-        ):
-            continue
-        command = line.split()[0]
-        existing_commands.add(command)
-    gdb.execute("set pagination %s" % current_pagination)  # Restore original setting
+    command_list = gdb.execute("help all", to_string=True).splitlines()
+    existing_commands = frozenset(
+        line.split(None, 1)[0]
+        for line in map(str.strip, command_list)
+        if line and not line.startswith(_SKIP_PREFIXES)
+    )
+    # Restore original setting
+    gdb.execute("set pagination %s" % ("on" if current_pagination else "off"))
     return existing_commands
 
 
 GDB_BUILTIN_COMMANDS = list_current_commands()
 
 
+# Argument separators used by GDB's argument splitting (C's isspace())
+_argv_token_re = re.compile(r"[^ \t\n\v\f\r]+")
+
+
+def string_to_argv(argument):
+    """Splits a command-line string into arguments the same way as ``gdb.string_to_argv``.
+
+    Only strings with quotes or backslashes are handed to GDB, everything else
+    is split on whitespace without a round-trip through GDB. Strings of only whitespace
+    are handed to GDB as well, as GDB before 15 returns ``['']`` for them, not ``[]``.
+    """
+    if "'" in argument or '"' in argument or "\\" in argument:
+        return gdb.string_to_argv(argument)
+    argv = _argv_token_re.findall(argument)
+    if not argv and argument:
+        return gdb.string_to_argv(argument)
+    return argv
+
+
 class Command(gdb.Command):
-    """Generic command wrapper"""
+    # Generic command wrapper. It has no docstring, as __doc__ is the slot for each command's help.
+    # Commands that keep state between runs (e.g. telescope.offset) store it in __dict__, which
+    # is only allocated for them.
+    __slots__ = (
+        "is_alias",
+        "aliases",
+        "category",
+        "shell",
+        "function",
+        "repeat",
+        "_pwndbg_requires",
+        "__name__",
+        "__doc__",
+        "__wrapped__",
+        "__dict__",
+    )
 
     builtin_override_whitelist = {"up", "down", "search", "pwd", "start", "ignore"}
-    history = {}  # type: Dict[int,str]
+    # Number and text of the last command entered on the TTY
+    _last_cmd_number = -1
+    _last_cmd_text = ""
 
     def __init__(
         self,
@@ -70,12 +101,17 @@ class Command(gdb.Command):
         if command_name is None:
             command_name = function.__name__
 
+        # GDB copies the help text while registering the command. Subclasses such as
+        # _ArgparsedCommand set their own first, otherwise it is the function's docstring.
+        if getattr(self, "__doc__", None) is None:
+            self.__doc__ = function.__doc__
+
         super(Command, self).__init__(
             command_name, gdb.COMMAND_USER, gdb.COMPLETE_EXPRESSION, prefix=prefix
         )
         self.function = function
 
-        if command_name in command_names:
+        if command_name in commands:
             raise Exception("Cannot add command %s: already exists." % command_name)
         if (
             command_name in GDB_BUILTIN_COMMANDS
@@ -83,14 +119,21 @@ class Command(gdb.Command):
         ):
             raise Exception('Cannot override non-whitelisted built-in command "%s"' % command_name)
 
-        command_names.add(command_name)
-        commands.append(self)
+        commands[command_name] = self
 
-        functools.update_wrapper(self, function)
         self.__name__ = command_name
+        self.__doc__ = function.__doc__
+        self.__wrapped__ = function
+        # Flags of the Only* decorators, which may also be applied to the command itself
+        self._pwndbg_requires = getattr(function, "_pwndbg_requires", 0)
 
         self.repeat = False
 
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        # Every class gets its own __doc__, which would hide the slot holding the command's help
+        cls.__doc__ = Command.__dict__["__doc__"]
+
     def split_args(self, argument):
         """Split a command-line string from the user into arguments.
 
@@ -98,7 +141,7 @@ class Command(gdb.Command):
             A ``(tuple, dict)``, in the form of ``*args, **kwargs``.
             The contents of the tuple/dict are undefined.
         """
-        return gdb.string_to_argv(argument), {}
+        return string_to_argv(argument), {}
 
     def invoke(self, argument, from_tty):
         """Invoke the command with an argument string"""
@@ -118,7 +161,7 @@ class Command(gdb.Command):
             self.repeat = False
 
     def check_repeated(self, argument, from_tty) -> bool:
-        """Keep a record of all commands which come from the TTY.
+        """Keep a record of the last command which came from the TTY.
 
         Returns:
             True if this command was executed by the user just hitting "enter".
@@ -127,14 +170,13 @@ class Command(gdb.Command):
         if not from_tty:
             return False
 
-        lines = gdb.execute("show commands", from_tty=False, to_string=True)
-        lines = lines.splitlines()
+        output = gdb.execute("show commands", from_tty=False, to_string=True).rstrip("\n")
 
         # No history
-        if not lines:
+        if not output:
             return False
 
-        last_line = lines[-1]
+        last_line = output[output.rfind("\n") + 1 :]
         number, command = last_line.split(None, 1)
         try:
             number = int(number)
@@ -144,18 +186,21 @@ class Command(gdb.Command):
             return False
 
         # A new command was entered by the user
-        if number not in Command.history:
-            Command.history[number] = command
+        if number != Command._last_cmd_number:
+            Command._last_cmd_number = number
+            Command._last_cmd_text = command
             return False
 
         # Somehow the command is different than we got before?
-        if not command.endswith(argument):
+        if not Command._last_cmd_text.endswith(argument):
             return False
 
         return True
 
     def __call__(self, *args, **kwargs):
         try:
+            if self._pwndbg_requires:
+                return _run_with_requirements(self.function, self._pwndbg_requires, args, kwargs)
             return self.function(*args, **kwargs)
         except TypeError as te:
             print("%r: %s" % (self.function.__name__.strip(), self.function.__doc__.strip()))
@@ -164,6 +209,48 @@ class Command(gdb.Command):
             pwndbg.exception.handle(self.function.__name__)
 
 
+# Registers, convenience variables and value history entries ($rsp, $foo, $1, $$)
+_gdb_variable_re = re.compile(r"\$(\w*)")
+# Assignments and function calls, which have side effects when evaluated
+_gdb_side_effect_re = re.compile(r"<<=|>>=|(?<![=!<>])=(?!=)|\+\+|--|[\w)]\s*\(")
+
+
+# Registers and locals depend on the selected thread and frame, which may also change without
+# a prompt in between (`thread apply`, `frame apply`, `up` in a `define` block or a script),
+# hence both are part of the key. str() of a frame is GDB's frame id.
+@pwndbg.lib.memoize.reset_on_prompt
+def _parse_and_eval_cached(expression, tid, frame_id):
+    return gdb.parse_and_eval(expression)
+
+
+@pwndbg.gdblib.events.stop
+@pwndbg.gdblib.events.mem_changed
+@pwndbg.gdblib.events.reg_changed
+def _clear_parse_and_eval_cache() -> None:
+    _parse_and_eval_cached.clear()
+
+
+def _parse_and_eval(expression):
+    """Evaluates ``expression`` with ``gdb.parse_and_eval``.
+
+    The result is reused until the next prompt, or until the program stops or its
+    memory or registers change, unless the expression has side effects or uses
+    convenience variables or the value history, which can change without any of
+    those events.
+    """
+    if not pwndbg.gdblib.proc.alive or _gdb_side_effect_re.search(expression):
+        return gdb.parse_and_eval(expression)
+
+    names = _gdb_variable_re.findall(expression)
+    if names:
+        registers = set(pwndbg.gdblib.regs.all)
+        registers.update(("pc", "sp", "fp", "ps"))
+        if not registers.issuperset(names):
+            return gdb.parse_and_eval(expression)
+
+    return _parse_and_eval_cached(expression, pwndbg.gdblib.proc.tid, str(gdb.selected_frame()))
+
+
 def fix(arg, sloppy=False, quiet=True, reraise=False):
     """Fix a single command-line argument coming from the GDB CLI.
 
@@ -181,14 +268,14 @@ def fix(arg, sloppy=False, quiet=True, reraise=False):
         return arg
 
     try:
-        parsed = gdb.parse_and_eval(arg)
+        parsed = _parse_and_eval(arg)
         return parsed
     except Exception:
         pass
 
     try:
         arg = pwndbg.gdblib.regs.fix(arg)
-        return gdb.parse_and_eval(arg)
+        return _parse_and_eval(arg)
     except Exception as e:
         if not quiet:
             print(e)
@@ -209,113 +296,131 @@ def fix_int_reraise(*a, **kw):
     return fix(*a, reraise=True, **kw)
 
 
-def OnlyWithFile(function):
-    @functools.wraps(function)
-    def _OnlyWithFile(*a, **kw):
-        if pwndbg.gdblib.proc.exe:
+# Requirements that the Only* decorators below declare for a command. They are
+# stored as flags on the decorated function and checked by Command.__call__, in
+# the order of _REQUIREMENT_CHECKS, before the command runs.
+REQUIRES_QEMU_KERNEL = 1 << 0
+REQUIRES_KERNEL_DEBUG_SYMS = 1 << 1
+REQUIRES_PAGING_ENABLED = 1 << 2
+REQUIRES_ARCH = 1 << 3
+REQUIRES_FILE = 1 << 4
+REQUIRES_RUNNING = 1 << 5
+REQUIRES_RESOLVED_HEAP_SYMS = 1 << 6
+REQUIRES_HEAP_INITIALIZED = 1 << 7
+REQUIRES_TCACHE = 1 << 8
+
+# Requirements checked before the heap symbols are resolved
+_HEAP_PRECONDITIONS = (
+    REQUIRES_QEMU_KERNEL
+    | REQUIRES_KERNEL_DEBUG_SYMS
+    | REQUIRES_PAGING_ENABLED
+    | REQUIRES_ARCH
+    | REQUIRES_FILE
+    | REQUIRES_RUNNING
+)
+
+_REQUIREMENT_CHECKS = (
+    (REQUIRES_QEMU_KERNEL, lambda function: pwndbg.gdblib.qemu.is_qemu_kernel()),
+    (REQUIRES_KERNEL_DEBUG_SYMS, lambda function: pwndbg.gdblib.kernel.has_debug_syms()),
+    (REQUIRES_PAGING_ENABLED, lambda function: pwndbg.gdblib.kernel.paging_enabled()),
+    (REQUIRES_ARCH, lambda function: pwndbg.gdblib.arch.name in function._pwndbg_arches),
+    (REQUIRES_FILE, lambda function: pwndbg.gdblib.proc.exe),
+    (REQUIRES_RUNNING, lambda function: pwndbg.gdblib.proc.alive),
+    (REQUIRES_HEAP_INITIALIZED, lambda function: pwndbg.heap.current.is_initialized()),
+    (REQUIRES_TCACHE, lambda function: pwndbg.heap.current.has_tcache()),
+)
+
+_REQUIREMENT_ERRORS = {
+    REQUIRES_QEMU_KERNEL: "This command may only be run when debugging the Linux kernel in QEMU.",
+    REQUIRES_KERNEL_DEBUG_SYMS: "This command may only be run when debugging a Linux kernel with debug symbols.",
+    REQUIRES_PAGING_ENABLED: "This command may only be run when paging is enabled.",
+    REQUIRES_ARCH: "This command may only be run on the {arches} architecture(s)",
+    REQUIRES_FILE: "There is no file loaded.",
+    REQUIRES_RUNNING: "The program is not being run.",
+    REQUIRES_HEAP_INITIALIZED: "Heap is not initialized yet.",
+    REQUIRES_TCACHE: "This version of GLIBC was not compiled with tcache support.",
+}
+
+
+def _req_error(function, template, **fmt) -> None:
+    print(message.error("%s: %s" % (function.__name__, template.format(**fmt))))
+
+
+def _print_requirement_error(function, flag) -> None:
+    if flag == REQUIRES_FILE and pwndbg.gdblib.qemu.is_qemu():
+        print(message.error("Could not determine the target binary on QEMU."))
+    elif flag == REQUIRES_ARCH:
+        _req_error(function, _REQUIREMENT_ERRORS[flag], arches=", ".join(function._pwndbg_arches))
+    else:
+        _req_error(function, _REQUIREMENT_ERRORS[flag])
+
+
+def requirements_met(function, requires) -> bool:
+    """Checks the ``REQUIRES_*`` flags in ``requires``, except for REQUIRES_RESOLVED_HEAP_SYMS.
+
+    Prints an error for the first requirement that is not met.
+    """
+    for flag, check in _REQUIREMENT_CHECKS:
+        if requires & flag and not check(function):
+            _print_requirement_error(function, flag)
+            return False
+    return True
+
+
+def _run_with_requirements(function, requires, a, kw):
+    if not requires & REQUIRES_RESOLVED_HEAP_SYMS:
+        if requirements_met(function, requires):
             return function(*a, **kw)
-        else:
-            if pwndbg.gdblib.qemu.is_qemu():
-                print(message.error("Could not determine the target binary on QEMU."))
-            else:
-                print(message.error("%s: There is no file loaded." % function.__name__))
+        return None
 
-    return _OnlyWithFile
+    if requirements_met(function, requires & _HEAP_PRECONDITIONS) and _resolve_heap_syms():
+        # The remaining checks use the resolved heap, so they may fail just like the command
+        remaining = requires & ~(_HEAP_PRECONDITIONS | REQUIRES_RESOLVED_HEAP_SYMS)
+        return _try2run_heap_command(function, remaining, a, kw)
+    return None
 
 
-def OnlyWhenQemuKernel(function):
-    @functools.wraps(function)
-    def _OnlyWhenQemuKernel(*a, **kw):
-        if pwndbg.gdblib.qemu.is_qemu_kernel():
-            return function(*a, **kw)
-        else:
-            print(
-                "%s: This command may only be run when debugging the Linux kernel in QEMU."
-                % function.__name__
-            )
+def _requires(function, flag):
+    function._pwndbg_requires = getattr(function, "_pwndbg_requires", 0) | flag
+    return function
+
+
+def OnlyWithFile(function):
+    return _requires(function, REQUIRES_FILE)
+
 
-    return _OnlyWhenQemuKernel
+def OnlyWhenQemuKernel(function):
+    return _requires(function, REQUIRES_QEMU_KERNEL)
 
 
 def OnlyWithArch(arch_names: List[str]):
     """Decorates function to work only with the specified archictectures."""
 
     def decorator(function):
-        @functools.wraps(function)
-        def _OnlyWithArch(*a, **kw):
-            if pwndbg.gdblib.arch.name in arch_names:
-                return function(*a, **kw)
-            else:
-                arches_str = ", ".join(arch_names)
-                print(
-                    f"%s: This command may only be run on the {arches_str} architecture(s)"
-                    % function.__name__
-                )
-
-        return _OnlyWithArch
+        function._pwndbg_arches = arch_names
+        return _requires(function, REQUIRES_ARCH)
 
     return decorator
 
 
 def OnlyWithKernelDebugSyms(function):
-    @functools.wraps(function)
-    def _OnlyWithKernelDebugSyms(*a, **kw):
-        if pwndbg.gdblib.kernel.has_debug_syms():
-            return function(*a, **kw)
-        else:
-            print(
-                "%s: This command may only be run when debugging a Linux kernel with debug symbols."
-                % function.__name__
-            )
-
-    return _OnlyWithKernelDebugSyms
+    return _requires(function, REQUIRES_KERNEL_DEBUG_SYMS)
 
 
 def OnlyWhenPagingEnabled(function):
-    @functools.wraps(function)
-    def _OnlyWhenPagingEnabled(*a, **kw):
-        if pwndbg.gdblib.kernel.paging_enabled():
-            return function(*a, **kw)
-        else:
-            print("%s: This command may only be run when paging is enabled." % function.__name__)
-
-    return _OnlyWhenPagingEnabled
+    return _requires(function, REQUIRES_PAGING_ENABLED)
 
 
 def OnlyWhenRunning(function):
-    @functools.wraps(function)
-    def _OnlyWhenRunning(*a, **kw):
-        if pwndbg.gdblib.proc.alive:
-            return function(*a, **kw)
-        else:
-            print("%s: The program is not being run." % function.__name__)
-
-    return _OnlyWhenRunning
+    return _requires(function, REQUIRES_RUNNING)
 
 
 def OnlyWithTcache(function):
-    @functools.wraps(function)
-    def _OnlyWithTcache(*a, **kw):
-        if pwndbg.heap.current.has_tcache():
-            return function(*a, **kw)
-        else:
-            print(
-                "%s: This version of GLIBC was not compiled with tcache support."
-                % function.__name__
-            )
-
-    return _OnlyWithTcache
+    return _requires(function, REQUIRES_TCACHE)
 
 
 def OnlyWhenHeapIsInitialized(function):
-    @functools.wraps(function)
-    def _OnlyWhenHeapIsInitialized(*a, **kw):
-        if pwndbg.heap.current.is_initialized():
-            return function(*a, **kw)
-        else:
-            print("%s: Heap is not initialized yet." % function.__name__)
-
-    return _OnlyWhenHeapIsInitialized
+    return _requires(function, REQUIRES_HEAP_INITIALIZED)
 
 
 # TODO/FIXME: Move this elsewhere? Have better logic for that? Maybe caching?
@@ -324,14 +429,14 @@ def _is_statically_linked() -> bool:
     return "No shared libraries loaded at this time." in out
 
 
-def _try2run_heap_command(function, a, kw):
-    e = lambda s: print(message.error(s))
+def _try2run_heap_command(function, requires, a, kw):
     w = lambda s: print(message.warn(s))
     # Note: We will still raise the error for developers when exception-* is set to "on"
     try:
-        return function(*a, **kw)
+        if requirements_met(function, requires):
+            return function(*a, **kw)
     except SymbolUnresolvableError as err:
-        e(f"{function.__name__}: Fail to resolve the symbol: `{err.symbol}`")
+        _req_error(function, "Fail to resolve the symbol: `{symbol}`", symbol=err.symbol)
         w(
             f"You can try to determine the libc symbols addresses manually and set them appropriately. For this, see the `heap_config` command output and set the config about `{err.symbol}`."
         )
@@ -340,7 +445,7 @@ def _try2run_heap_command(function, a, kw):
         else:
             pwndbg.exception.inform_verbose_and_debug()
     except Exception as err:
-        e(f"{function.__name__}: An unknown error occurred when running this command.")
+        _req_error(function, "An unknown error occurred when running this command.")
         if isinstance(pwndbg.heap.current, HeuristicHeap):
             w(
                 "Maybe you can try to determine the libc symbols addresses manually, set them appropriately and re-run this command. For this, see the `heap_config` command output and set the `main_arena`, `mp_`, `global_max_fast`, `tcache` and `thread_arena` addresses."
@@ -353,82 +458,111 @@ def _try2run_heap_command(function, a, kw):
             pwndbg.exception.inform_verbose_and_debug()
 
 
+def _print_glibc_not_found() -> None:
+    print(
+        message.error(
+            "Can't find GLIBC version required for this command to work, maybe is because GLIBC is not loaded yet."
+        )
+    )
+    print(
+        message.warn(
+            "If you believe the GLIBC is loaded or this is a statically linked binary. "
+            "Please set the GLIBC version you think the target binary was compiled (using `set glibc <version>` command; e.g. 2.32) and re-run this command"
+        )
+    )
+
+
+def _print_set_glibc_hint() -> None:
+    print(
+        message.warn(
+            "Please set the GLIBC version you think the target binary was compiled (using `set glibc <version>` command; e.g. 2.32) and re-run this command."
+        )
+    )
+
+
+def _switch_to_heuristic_heap() -> bool:
+    # In auto mode, if the debug symbols are not enough, we will try to use the heuristic if possible
+    heuristic_heap = HeuristicHeap()
+    if heuristic_heap.can_be_resolved():
+        pwndbg.heap.current = heuristic_heap
+        print(
+            message.warn(
+                "pwndbg will try to resolve the heap symbols via heuristic now since we cannot resolve the heap via the debug symbols.\n"
+                "This might not work in all cases. Use `help set resolve-heap-via-heuristic` for more details.\n"
+            )
+        )
+        return True
+    if _is_statically_linked():
+        print(
+            message.error(
+                "Can't find GLIBC version required for this command to work since this is a statically linked binary"
+            )
+        )
+        _print_set_glibc_hint()
+    else:
+        _print_glibc_not_found()
+    return False
+
+
+def _debug_syms_heap_forced_error() -> bool:
+    print(
+        message.error(
+            "You are forcing to resolve the heap symbols via heuristic, but we cannot resolve the heap via the debug symbols."
+        )
+    )
+    print(message.warn("Use `set resolve-heap-via-heuristic auto` and re-run this command."))
+    return False
+
+
+def _unresolved_heap_error() -> bool:
+    if pwndbg.glibc.get_version() is not None:
+        # Note: Should not see this error, but just in case
+        print(message.error("An unknown error occurred when resolved the heap."))
+        pwndbg.exception.inform_report_issue("An unknown error occurred when resolved the heap")
+    elif _is_statically_linked():
+        print(message.error("Can't resolve the heap since the GLIBC version is not set."))
+        _print_set_glibc_hint()
+    else:
+        _print_glibc_not_found()
+    return False
+
+
+# What to do when the current heap cannot be resolved, keyed by its class and the value of
+# resolve-heap-via-heuristic. Other combinations fail with _unresolved_heap_error.
+# Each handler returns whether the heap can be used after all.
+_HEAP_DECISION = {
+    (DebugSymsHeap, "auto"): _switch_to_heuristic_heap,
+    (DebugSymsHeap, "force"): _debug_syms_heap_forced_error,
+}
+
+
+def _resolve_heap_syms() -> bool:
+    """Returns whether the heap symbols can be resolved, printing why if they cannot.
+
+    In auto mode, this switches between resolving them via the debug symbols
+    and via heuristics as needed.
+    """
+    mode = pwndbg.gdblib.config.resolve_heap_via_heuristic.value
+    if (
+        mode == "auto"
+        and isinstance(pwndbg.heap.current, HeuristicHeap)
+        and DebugSymsHeap().can_be_resolved()
+    ):
+        # In auto mode, we will try to use the debug symbols if possible
+        pwndbg.heap.current = DebugSymsHeap()
+    if pwndbg.heap.current.can_be_resolved():
+        return True
+    handler = _HEAP_DECISION.get((type(pwndbg.heap.current), mode), _unresolved_heap_error)
+    return handler()
+
+
 def OnlyWithResolvedHeapSyms(function):
-    @functools.wraps(function)
-    def _OnlyWithResolvedHeapSyms(*a, **kw):
-        e = lambda s: print(message.error(s))
-        w = lambda s: print(message.warn(s))
-        if (
-            isinstance(pwndbg.heap.current, HeuristicHeap)
-            and pwndbg.gdblib.config.resolve_heap_via_heuristic == "auto"
-            and DebugSymsHeap().can_be_resolved()
-        ):
-            # In auto mode, we will try to use the debug symbols if possible
-            pwndbg.heap.current = DebugSymsHeap()
-        if pwndbg.heap.current.can_be_resolved():
-            return _try2run_heap_command(function, a, kw)
-        else:
-            if (
-                isinstance(pwndbg.heap.current, DebugSymsHeap)
-                and pwndbg.gdblib.config.resolve_heap_via_heuristic == "auto"
-            ):
-                # In auto mode, if the debug symbols are not enough, we will try to use the heuristic if possible
-                heuristic_heap = HeuristicHeap()
-                if heuristic_heap.can_be_resolved():
-                    pwndbg.heap.current = heuristic_heap
-                    w(
-                        "pwndbg will try to resolve the heap symbols via heuristic now since we cannot resolve the heap via the debug symbols.\n"
-                        "This might not work in all cases. Use `help set resolve-heap-via-heuristic` for more details.\n"
-                    )
-                    return _try2run_heap_command(function, a, kw)
-                elif _is_statically_linked():
-                    e(
-                        "Can't find GLIBC version required for this command to work since this is a statically linked binary"
-                    )
-                    w(
-                        "Please set the GLIBC version you think the target binary was compiled (using `set glibc <version>` command; e.g. 2.32) and re-run this command."
-                    )
-                else:
-                    e(
-                        "Can't find GLIBC version required for this command to work, maybe is because GLIBC is not loaded yet."
-                    )
-                    w(
-                        "If you believe the GLIBC is loaded or this is a statically linked binary. "
-                        "Please set the GLIBC version you think the target binary was compiled (using `set glibc <version>` command; e.g. 2.32) and re-run this command"
-                    )
-            elif (
-                isinstance(pwndbg.heap.current, DebugSymsHeap)
-                and pwndbg.gdblib.config.resolve_heap_via_heuristic == "force"
-            ):
-                e(
-                    "You are forcing to resolve the heap symbols via heuristic, but we cannot resolve the heap via the debug symbols."
-                )
-                w("Use `set resolve-heap-via-heuristic auto` and re-run this command.")
-            elif pwndbg.glibc.get_version() is None:
-                if _is_statically_linked():
-                    e("Can't resolve the heap since the GLIBC version is not set.")
-                    w(
-                        "Please set the GLIBC version you think the target binary was compiled (using `set glibc <version>` command; e.g. 2.32) and re-run this command."
-                    )
-                else:
-                    e(
-                        "Can't find GLIBC version required for this command to work, maybe is because GLIBC is not loaded yet."
-                    )
-                    w(
-                        "If you believe the GLIBC is loaded or this is a statically linked binary. "
-                        "Please set the GLIBC version you think the target binary was compiled (using `set glibc <version>` command; e.g. 2.32) and re-run this command"
-                    )
-            else:
-                # Note: Should not see this error, but just in case
-                e("An unknown error occurred when resolved the heap.")
-                pwndbg.exception.inform_report_issue(
-                    "An unknown error occurred when resolved the heap"
-                )
-
-    return _OnlyWithResolvedHeapSyms
+    return _requires(function, REQUIRES_RESOLVED_HEAP_SYMS)
 
 
 class _ArgparsedCommand(Command):
+    __slots__ = ("parser",)
+
     def __init__(
         self,
         parser,
@@ -446,10 +580,7 @@ class _ArgparsedCommand(Command):
         else:
             self.parser.prog = command_name
 
-        file = io.StringIO()
-        self.parser.print_help(file)
-        file.seek(0)
-        self.__doc__ = file.read()
+        self.__doc__ = self.parser.format_help()
         # Note: function.__doc__ is used in the `pwndbg [filter]` command display
         function.__doc__ = self.parser.description.strip()
 
@@ -464,7 +595,7 @@ class _ArgparsedCommand(Command):
         )
 
     def split_args(self, argument):
-        argv = gdb.string_to_argv(argument)
+        argv = string_to_argv(argument)
         return tuple(), vars(self.parser.parse_args(argv))
 
 
@@ -482,6 +613,11 @@ class ArgparsedCommand:
         self.aliases = aliases
         self._command_name = command_name
         self.category = category
+        # A parser may be passed to several ArgparsedCommands, so only adjust it once
+        if getattr(self.parser, "_pwndbg_defaults_applied", False):
+            return
+        self.parser._pwndbg_defaults_applied = True
+
         # We want to run all integer and otherwise-unspecified arguments
         # through fix() so that GDB parses it.
         for action in self.parser._actions:
@@ -512,6 +648,10 @@ class ArgparsedCommand:
 _mask = 0xFFFFFFFFFFFFFFFF
 _mask_val_type = gdb.Value(_mask).type
 
+# Decimal and hexadecimal literals, which Python's int(s, 0) parses just like GDB
+# (decimal ones only while GDB's input-radix is 10)
+_int_literal_re = re.compile(r"\A\s*-?(?:0[xX][0-9a-fA-F]+|(?P<dec>[1-9][0-9]*)|0)\s*\Z")
+
 
 def sloppy_gdb_parse(s):
     """
@@ -524,14 +664,25 @@ def sloppy_gdb_parse(s):
     :return: Whatever gdb.parse_and_eval returns or string.
     """
     try:
-        val = gdb.parse_and_eval(s)
-        # We can't just return int(val) because GDB may return:
-        # "Python Exception <class 'gdb.error'> Cannot convert value to long."
-        # e.g. for:
-        # pwndbg> pi int(gdb.parse_and_eval('__libc_start_main'))
-        #
-        # Here, the _mask_val.type should be `unsigned long long`
-        return int(val.cast(_mask_val_type))
+        # Plain numbers don't need a round-trip through GDB, unless they are
+        # too large for it to parse
+        m = _int_literal_re.match(s)
+        if m and (not m.group("dec") or gdb.parameter("input-radix") == 10):
+            val = int(s, 0)
+            if abs(val) <= _mask:
+                return val & _mask
+
+        val = _parse_and_eval(s)
+        try:
+            return int(val) & _mask
+        except (TypeError, gdb.error):
+            # We can't always return int(val) because GDB may return:
+            # "Python Exception <class 'gdb.error'> Cannot convert value to long."
+            # e.g. for:
+            # pwndbg> pi int(gdb.parse_and_eval('__libc_start_main'))
+            #
+            # Here, the _mask_val.type should be `unsigned long long`
+            return int(val.cast(_mask_val_type))
     except (TypeError, gdb.error):
         return s
 
@@ -548,15 +699,17 @@ def AddressExpr(s):
     return val
 
 
+_hex_literal_re = re.compile(r"\A(?:0[xX])?[0-9a-fA-F]+\Z")
+
+
 def HexOrAddressExpr(s):
     """
     Parses string as hexadecimal int or an address expression. Returns an int.
     (e.g. '1234' will return 0x1234)
     """
-    try:
+    if _hex_literal_re.match(s):
         return int(s, 16)
-    except ValueError:
-        return AddressExpr(s)
+    return AddressExpr(s)
 
 
 def load_commands() -> None:
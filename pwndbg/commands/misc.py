@@ -131,7 +131,7 @@ def distance(a, b) -> None:
 
 
 def list_and_filter_commands(filter_str, pwndbg_cmds=True, shell_cmds=False):
-    sorted_commands = list(pwndbg.commands.commands)
+    sorted_commands = list(pwndbg.commands.commands.values())
     sorted_commands.sort(key=lambda x: x.__name__)
 
     if filter_str:
@@ -1,3 +1,5 @@
+import operator
+
 import gdb
 
 import pwndbg.commands
@@ -10,29 +12,23 @@ class segment(gdb.Function):
     def __init__(self, name) -> None:
         super(segment, self).__init__(name)
         self.name = name
+        self._getter = operator.attrgetter(name)
 
     def invoke(self, arg=0):
-        result = getattr(pwndbg.gdblib.regs, self.name)
-        return result + arg
+        return self._getter(pwndbg.gdblib.regs) + arg
 
 
-segment("fsbase")
-segment("gsbase")
+_fsbase = segment("fsbase")
+_gsbase = segment("gsbase")
 
 
 @pwndbg.commands.ArgparsedCommand("Prints out the FS base address. See also $fsbase.")
 @pwndbg.commands.OnlyWhenRunning
 def fsbase() -> None:
-    """
-    Prints out the FS base address. See also $fsbase.
-    """
-    print(hex(int(pwndbg.gdblib.regs.fsbase)))
+    print(hex(int(_fsbase.invoke())))
 
 
 @pwndbg.commands.ArgparsedCommand("Prints out the GS base address. See also $gsbase.")
 @pwndbg.commands.OnlyWhenRunning
 def gsbase() -> None:
-    """
-    Prints out the GS base address. See also $gsbase.
-    """
-    print(hex(int(pwndbg.gdblib.regs.gsbase)))
+    print(hex(int(_gsbase.invoke())))
@@ -15,6 +15,7 @@ from typing import List
 import gdb
 from elftools.elf.constants import SH_FLAGS
 from elftools.elf.elffile import ELFFile
+from elftools.elf.sections import NoteSection
 
 import pwndbg.auxv
 import pwndbg.gdblib.abi
@@ -142,6 +143,22 @@ def get_elf_info_rebased(filepath, vaddr):
     return ELFInfo(headers, sections, segments)
 
 
+@pwndbg.lib.memoize.reset_on_objfile
+def get_build_id(filepath):
+    """
+    Return the GNU build ID of the ELF file as a hex string, or None if it has none.
+    """
+    local_path = pwndbg.gdblib.file.get_file(filepath)
+    with open(local_path, "rb") as f:
+        for sec in ELFFile(f).iter_sections():
+            if not isinstance(sec, NoteSection):
+                continue
+            for note in sec.iter_notes():
+                if note["n_type"] == "NT_GNU_BUILD_ID":
+                    return note["n_desc"]
+    return None
+
+
 def get_containing_segments(elf_filepath, elf_loadaddr, vaddr):
     elf = get_elf_info_rebased(elf_filepath, elf_loadaddr)
     segments = []
@@ -15,9 +15,9 @@ from pwndbg.lib.tips import get_tip_of_the_day
 funcs_list_str = ", ".join(message.notice("$" + f.name) for f in pwndbg.gdblib.functions.functions)
 
 num_pwndbg_cmds = sum(
-    1 for _ in filter(lambda c: not (c.shell or c.is_alias), pwndbg.commands.commands)
+    1 for _ in filter(lambda c: not (c.shell or c.is_alias), pwndbg.commands.commands.values())
 )
-num_shell_cmds = sum(1 for _ in filter(lambda c: c.shell, pwndbg.commands.commands))
+num_shell_cmds = sum(1 for _ in filter(lambda c: c.shell, pwndbg.commands.commands.values()))
 hint_lines = (
     "loaded %i pwndbg commands and %i shell commands. Type %s for a list."
     % (num_pwndbg_cmds, num_shell_cmds, message.notice("pwndbg [--shell | --all] [filter]")),
@@ -1,22 +1,55 @@
+import json
 import os
+import urllib.parse
 
 import gdb
 
 import pwndbg.color.context as C
 import pwndbg.color.syntax_highlight as H
+import pwndbg.gdblib.elf
 import pwndbg.gdblib.regs
+import pwndbg.gdblib.symbol
+import pwndbg.lib.memoize
+import pwndbg.lib.tempfile
 import pwndbg.radare2
 
 
-def decompile(func=None):
+def _function_start(address):
     """
-    Return the source of the given function decompiled by ghidra.
+    Return the address of the symbol containing address, or None if there is none.
+    """
+    symbol = pwndbg.gdblib.symbol.get(address, gdb_only=True)
+    if not symbol:
+        return None
+    # Symbols look like "main" or "main+12"
+    offset = symbol.rpartition("+")[2]
+    return address - int(offset) if offset.isdigit() else address
 
-    If no function is given, decompile the function within the current pc.
-    This function requires radare2, r2pipe and r2ghidra.
 
-    Raises Exception if any fatal error occurs.
+@pwndbg.lib.memoize.reset_on_objfile
+def _decompile_json(func, base, persist=True):
+    """
+    Return the r2ghidra JSON output for func in the binary rebased to base.
+
+    Decompiling is slow, so results are also stored in the pwndbg cache
+    directory, keyed by the build ID of the binary. Binaries without one,
+    and calls with persist=False, are only cached in memory.
     """
+    path = None
+    filename = gdb.current_progspace().filename
+    build_id = pwndbg.gdblib.elf.get_build_id(filename) if filename and persist else None
+    if build_id:
+        path = os.path.join(
+            pwndbg.lib.tempfile.cachedir("ghidra"),
+            build_id,
+            "%#x-%s.json" % (base, urllib.parse.quote(func, safe="")),
+        )
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+
     try:
         r2 = pwndbg.radare2.r2pipe()
     except ImportError:
@@ -27,17 +60,45 @@ def decompile(func=None):
     if "pdg" not in r2.cmd("LD").split("\n"):
         raise Exception("radare2 plugin r2ghidra must be installed and available from r2")
 
-    if not func:
-        func = (
-            hex(pwndbg.gdblib.regs[pwndbg.gdblib.regs.current.pc])
-            if pwndbg.gdblib.proc.alive
-            else "main"
-        )
-
     src = r2.cmdj("pdgj @" + func)
     if not src:
         raise Exception("Decompile command failed, check if '{}' is a valid target".format(func))
 
+    if path:
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                json.dump(src, f)
+        except OSError:
+            pass
+    return src
+
+
+def decompile(func=None):
+    """
+    Return the source of the given function decompiled by ghidra.
+
+    If no function is given, decompile the function within the current pc.
+    This function requires radare2, r2pipe and r2ghidra.
+
+    Raises Exception if any fatal error occurs.
+    """
+    persist = True
+    if not func:
+        if pwndbg.gdblib.proc.alive:
+            # Decompile from the start of the function, so that every pc within it shares
+            # one cache entry. Without a symbol, the pc is not worth keeping on disk.
+            pc = pwndbg.gdblib.regs[pwndbg.gdblib.regs.current.pc]
+            start = _function_start(pc)
+            persist = start is not None
+            func = hex(pc if start is None else start)
+        else:
+            func = "main"
+
+    filename = gdb.current_progspace().filename
+    base = pwndbg.radare2.base_address(filename) if filename else 0
+    src = _decompile_json(func, base, persist)
+
     current_line_marker = "/*%%PWNDBG_CODE_MARKER%%*/"
     source = src.get("code", "")
 
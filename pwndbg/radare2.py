@@ -4,6 +4,15 @@ import pwndbg.gdblib.elf
 import pwndbg.lib.memoize
 
 
+def base_address(filename):
+    """
+    Return the address r2pipe() rebases the binary to, or 0 if it is not rebased.
+    """
+    if pwndbg.gdblib.elf.get_elf_info(filename).is_pie and pwndbg.gdblib.elf.exe():
+        return pwndbg.gdblib.elf.exe().address
+    return 0
+
+
 @pwndbg.lib.memoize.reset_on_start
 @pwndbg.lib.memoize.reset_on_objfile
 def r2pipe():
@@ -27,8 +36,9 @@ def r2pipe():
     import r2pipe
 
     flags = ["-e", "io.cache=true"]
-    if pwndbg.gdblib.elf.get_elf_info(filename).is_pie and pwndbg.gdblib.elf.exe():
-        flags.extend(["-B", hex(pwndbg.gdblib.elf.exe().address)])
+    base = base_address(filename)
+    if base:
+        flags.extend(["-B", hex(base)])
     r2 = r2pipe.open(filename, flags=flags)
     r2.cmd("aaaa")
     return r2
@@ -18,9 +18,10 @@ class OnlyWithCommand:
     def __call__(self, function):
         function.cmd = self.cmd
 
-        @pwndbg.commands.OnlyWithFile
         @functools.wraps(function)
         def _OnlyWithCommand(*a, **kw):
+            if not pwndbg.commands.requirements_met(function, pwndbg.commands.REQUIRES_FILE):
+                return None
             if self.cmd_path:
                 return function(*a, **kw)
             else:
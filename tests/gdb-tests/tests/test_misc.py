@@ -27,9 +27,13 @@ def test_list_and_filter_commands_full_list(pwndbg_cmds, shell_cmds):
 
     commands = []
     if pwndbg_cmds:
-        commands.extend([c for c in pwndbg.commands.commands if not c.is_alias and not c.shell])
+        commands.extend(
+            [c for c in pwndbg.commands.commands.values() if not c.is_alias and not c.shell]
+        )
     if shell_cmds:
-        commands.extend([c for c in pwndbg.commands.commands if not c.is_alias and c.shell])
+        commands.extend(
+            [c for c in pwndbg.commands.commands.values() if not c.is_alias and c.shell]
+        )
 
     cmd_name_docs = [(c.__name__, c.aliases, c.category, get_doc(c)) for c in commands]
     cmd_name_docs.sort()
@@ -0,0 +1,44 @@
+import gdb
+import pytest
+
+import pwndbg.commands
+import tests
+
+REFERENCE_BINARY = tests.binaries.get("reference-binary.out")
+
+
+@pytest.mark.parametrize("s", ("0", "10", " 12 ", "0x10", "0XdeadBEEF", "-5", "0xffffffffffffffff"))
+def test_sloppy_gdb_parse_int_literals_match_gdb(s):
+    expected = int(gdb.parse_and_eval(s).cast(pwndbg.commands._mask_val_type))
+    assert pwndbg.commands.sloppy_gdb_parse(s) == expected
+
+
+@pytest.mark.parametrize("s", ("0", "10", "-10", "0x10"))
+def test_sloppy_gdb_parse_int_literals_use_input_radix(s):
+    gdb.execute("set input-radix 16")
+    try:
+        expected = int(gdb.parse_and_eval(s).cast(pwndbg.commands._mask_val_type))
+        assert pwndbg.commands.sloppy_gdb_parse(s) == expected
+    finally:
+        # The radix itself is read in the current one
+        gdb.execute("set input-radix 0xa")
+
+
+@pytest.mark.parametrize("s", ("010", "0x1ffffffffffffffff", "nonexistentsymbol"))
+def test_sloppy_gdb_parse_falls_back_to_gdb(s):
+    try:
+        expected = int(gdb.parse_and_eval(s).cast(pwndbg.commands._mask_val_type))
+    except gdb.error:
+        expected = s
+    assert pwndbg.commands.sloppy_gdb_parse(s) == expected
+
+
+@pytest.mark.parametrize("op", ("<<=", ">>=", "+="))
+def test_sloppy_gdb_parse_does_not_cache_assignments(start_binary, op):
+    start_binary(REFERENCE_BINARY)
+    gdb.execute("set $rax = 0x100")
+
+    first = pwndbg.commands.sloppy_gdb_parse("$rax %s 1" % op)
+    second = pwndbg.commands.sloppy_gdb_parse("$rax %s 1" % op)
+    assert first != second
+    assert pwndbg.gdblib.regs.rax == second
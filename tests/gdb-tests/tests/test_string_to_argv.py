@@ -0,0 +1,21 @@
+import gdb
+import pytest
+
+import pwndbg.commands
+
+
+@pytest.mark.parametrize(
+    "argument",
+    (
+        "",
+        "   ",
+        "hexdump $rsp 1000",
+        " \tsearch  -t   qword\n0x1234 ",
+        "telescope $rsp+8*4",
+        "search -s 'a b' \"c d\"",
+        "xor a\\ b 'c\\'d'",
+        "errno ''",
+    ),
+)
+def test_string_to_argv_matches_gdb(argument):
+    assert pwndbg.commands.string_to_argv(argument) == gdb.string_to_argv(argument)